@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Texas Instruments Incorporated
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Build and optionally upload a TI K3 ROM boot image.
+
+Combines a user firmware binary with the system firmware blob, its
+certificate and the board configuration artifact into a single image the
+boot ROM accepts, signed with an x509 certificate that records the
+SHA-512 digest of every component. The resulting image can then be
+streamed to the device over the ROM UART boot interface, which expects
+XMODEM-1K framing with CRC16 protected blocks.
+"""
+
+import argparse
+import binascii
+import functools
+import hashlib
+import json
+import os
+import queue
+import select
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import serial
+except ImportError:
+    serial = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+SOH = b"\x01"
+STX = b"\x02"
+EOT = b"\x04"
+ACK = b"\x06"
+PING = b"C"
+
+_CRC16_BE = struct.Struct(">H")
+
+CERT_TEMPLATE = """\
+[ req ]
+distinguished_name     = req_distinguished_name
+x509_extensions        = x509_evm
+prompt                 = no
+dirstring_type         = nobmp
+
+[ req_distinguished_name ]
+C                      = US
+ST                     = TX
+L                      = Dallas
+O                      = Texas Instruments Incorporated
+OU                     = Processors
+CN                     = TI Support
+emailAddress           = support@ti.com
+
+[ x509_evm ]
+basicConstraints       = CA:true
+1.3.6.1.4.1.294.1.3    = ASN1:SEQUENCE:swrv
+1.3.6.1.4.1.294.1.34   = ASN1:SEQUENCE:firmware_image_integrity
+1.3.6.1.4.1.294.1.35   = ASN1:SEQUENCE:sysfw_image_integrity
+1.3.6.1.4.1.294.1.36   = ASN1:SEQUENCE:board_config_integrity
+
+[ swrv ]
+swrv                   = INTEGER:1
+
+[ firmware_image_integrity ]
+shaType                = OID:2.16.840.1.101.3.4.2.3
+shaValue               = FORMAT:HEX,OCT:{firmware_hash}
+imageSize              = INTEGER:{firmware_length}
+
+[ sysfw_image_integrity ]
+shaType                = OID:2.16.840.1.101.3.4.2.3
+shaValue               = FORMAT:HEX,OCT:{sysfw_hash}
+imageSize              = INTEGER:{sysfw_length}
+
+[ board_config_integrity ]
+shaType                = OID:2.16.840.1.101.3.4.2.3
+shaValue               = FORMAT:HEX,OCT:{board_config_hash}
+imageSize              = INTEGER:{board_config_length}
+"""
+
+
+_HASH_CACHE_LOCK = threading.Lock()
+
+
+def _hash_cache_file():
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_home / "ti-k3-rom-image-gen" / "sha512.json"
+
+
+def _load_hash_cache(cache_file):
+    try:
+        with open(cache_file) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _hash_cache_lookup(key):
+    with _HASH_CACHE_LOCK:
+        return _load_hash_cache(_hash_cache_file()).get(key)
+
+
+def _hash_cache_store(key, digest):
+    cache_file = _hash_cache_file()
+    with _HASH_CACHE_LOCK:
+        cache = _load_hash_cache(cache_file)
+        cache[key] = digest
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(cache))
+        except OSError:
+            # Caching is best effort
+            pass
+
+
+class BinaryData:
+    """A binary input file together with its SHA-512 digest."""
+
+    def __init__(self, path, use_cache=True):
+        self._path = Path(path)
+        cache_key = None
+        cached_hash = None
+        if use_cache:
+            stat = self._path.stat()
+            cache_key = f"{self._path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+            cached_hash = _hash_cache_lookup(cache_key)
+        with open(self._path, "rb") as file:
+            if cached_hash is None:
+                try:
+                    sha512 = hashlib.file_digest(file, "sha512")
+                except AttributeError:
+                    # Python < 3.11 has no streaming helper
+                    sha512 = hashlib.sha512(file.read())
+                file.seek(0)
+            self._data = file.read()
+        if cached_hash is None:
+            # hexdigest() is specified to return exactly 2 * digest_size
+            # characters, so no zero padding is needed.
+            cached_hash = sha512.hexdigest()
+            if use_cache:
+                _hash_cache_store(cache_key, cached_hash)
+        self._hash = cached_hash
+
+    def get_data(self):
+        # A view avoids another copy at the I/O boundary during image assembly
+        return memoryview(self._data)
+
+    def get_hash(self):
+        return self._hash
+
+    def get_length(self):
+        return len(self._data)
+
+
+class ImageBinaries:
+    """The set of input binaries that make up a ROM boot image."""
+
+    def __init__(self, user_firmware, sysfw_blob, sysfw_cert, board_config):
+        self._user_firmware = user_firmware
+        self._sysfw_blob = sysfw_blob
+        self._sysfw_cert = sysfw_cert
+        self._board_config = board_config
+
+    def get_user_firmware(self):
+        return self._user_firmware
+
+    def get_sysfw_blob(self):
+        return self._sysfw_blob
+
+    def get_sysfw_cert(self):
+        return self._sysfw_cert
+
+    def get_board_config(self):
+        return self._board_config
+
+
+class OutputBinary:
+    """Signs the input binaries and assembles the final boot image."""
+
+    def __init__(self, binaries, private_key_path, output_path):
+        self._binaries = binaries
+        self._private_key_path = Path(private_key_path)
+        self._output_path = Path(output_path)
+
+    def _write_certificate_config(self, certificate_config):
+        binaries = self._binaries
+        certificate_config.write_text(
+            CERT_TEMPLATE.format(
+                firmware_hash=binaries.get_user_firmware().get_hash(),
+                firmware_length=binaries.get_user_firmware().get_length(),
+                sysfw_hash=binaries.get_sysfw_blob().get_hash(),
+                sysfw_length=binaries.get_sysfw_blob().get_length(),
+                board_config_hash=binaries.get_board_config().get_hash(),
+                board_config_length=binaries.get_board_config().get_length(),
+            )
+        )
+
+    def write_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            certificate_config = Path(tmp_dir) / "certificate.cfg"
+            certificate_output = Path(tmp_dir) / "certificate.der"
+            self._write_certificate_config(certificate_config)
+            subprocess.run(
+                [
+                    "openssl",
+                    "req",
+                    "-new",
+                    "-x509",
+                    "-key",
+                    str(self._private_key_path),
+                    "-nodes",
+                    "-outform",
+                    "DER",
+                    "-out",
+                    str(certificate_output),
+                    "-config",
+                    str(certificate_config),
+                    "-sha512",
+                ],
+                capture_output=True,
+                check=True,
+            )
+            # The certificate is regenerated in a fresh temporary path on every
+            # build, so its digest must not pollute the persistent cache
+            certificate_binary = BinaryData(certificate_output, use_cache=False)
+
+        parts = [
+            certificate_binary.get_data(),
+            self._binaries.get_user_firmware().get_data(),
+            self._binaries.get_sysfw_blob().get_data(),
+            self._binaries.get_sysfw_cert().get_data(),
+            self._binaries.get_board_config().get_data(),
+        ]
+        if hasattr(os, "writev"):
+            with open(self._output_path, "wb", buffering=0) as output_file:
+                written = os.writev(output_file.fileno(), parts)
+                if written != sum(len(part) for part in parts):
+                    raise OSError(f"short write while assembling {self._output_path}")
+        else:
+            with open(self._output_path, "wb", buffering=1 << 20) as output_file:
+                for part in parts:
+                    output_file.write(part)
+
+
+@functools.cache
+def _make_crc16_table(polynomial):
+    """Precompute the CRC16 of every single byte value for the given polynomial."""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) & 0xFFFF) ^ polynomial
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+if np is not None and njit is not None:
+
+    @njit(cache=True)
+    def _crc16_jit(buf, table, initial_crc):
+        crc = initial_crc
+        for byte in buf:
+            crc = ((crc << 8) ^ table[((crc >> 8) ^ byte) & 0xFF]) & 0xFFFF
+        return crc
+
+else:
+    _crc16_jit = None
+
+
+class TransferDataCreator:
+    """Splits a boot image into the XMODEM-1K chunks the boot ROM expects."""
+
+    def __init__(self, data, polynomial=0x1021, skip_crc=False):
+        # Slicing a view is O(1); only the padded short block is ever copied
+        self._view = memoryview(data)
+        self._polynomial = polynomial
+        self._skip_crc = skip_crc
+        self._crc16_table = _make_crc16_table(polynomial)
+        if _crc16_jit is not None:
+            self._crc16_table_np = np.array(self._crc16_table, dtype=np.uint16)
+
+    def calc_crc16(self, data, initial_crc=0):
+        if self._polynomial == 0x1021:
+            # CRC16-CCITT/XMODEM is exactly what the C-implemented builtin computes
+            return binascii.crc_hqx(data, initial_crc)
+        if _crc16_jit is not None:
+            buf = np.frombuffer(data, dtype=np.uint8)
+            return int(_crc16_jit(buf, self._crc16_table_np, initial_crc))
+        crc = initial_crc
+        table = self._crc16_table
+        for byte in data:
+            crc = ((crc << 8) ^ table[((crc >> 8) ^ byte) & 0xFF]) & 0xFFFF
+        return crc
+
+    def _pad_data(self, data):
+        target = 128 if len(data) <= 128 else 1024
+        if len(data) == target:
+            return data
+        return bytes(data).ljust(target, b"\x00")
+
+    def _construct_single_chunk(self, data, block_num):
+        padded_data = self._pad_data(data)
+        crc = 0 if self._skip_crc else self.calc_crc16(padded_data)
+        chunk = bytearray(3 + len(padded_data) + 2)
+        chunk[0:1] = SOH if len(data) <= 128 else STX
+        chunk[1] = block_num
+        chunk[2] = 0xFF - block_num
+        chunk[3 : 3 + len(padded_data)] = padded_data
+        _CRC16_BE.pack_into(chunk, 3 + len(padded_data), crc)
+        return bytes(chunk)
+
+    def get_transfer_chunks(self):
+        chunks = []
+        block_num = 1
+        for offset in range(0, len(self._view), 1024):
+            part = self._view[offset : offset + 1024]
+            chunks.append(self._construct_single_chunk(part, block_num))
+            block_num = (block_num + 1) % 256
+        return chunks
+
+
+class FirmwareUploader:
+    """Streams the transfer chunks to the boot ROM over UART."""
+
+    def __init__(self, port, baudrate=115200, no_verify=False):
+        self._port = port
+        self._baudrate = baudrate
+        self._no_verify = no_verify
+
+    @staticmethod
+    def _read_acks(uart, expected_acks, errors):
+        if os.name == "posix":
+            # Read the ACK bytes straight off the fd, bypassing pyserial's
+            # per-call bookkeeping on the hot path.
+            fd = uart.fileno()
+
+            def read_ack():
+                if select.select([fd], [], [], uart.timeout)[0]:
+                    return os.read(fd, 1)
+                return b""
+
+        else:
+            read_ack = uart.read
+        for block in range(expected_acks):
+            ack = read_ack()
+            if ack != ACK:
+                errors.put(RuntimeError(f"device rejected block {block + 1} (got {ack!r})"))
+                return
+
+    @staticmethod
+    def _write_stream(uart, stream):
+        if os.name != "posix":
+            uart.write(stream)
+            return
+        fd = uart.fileno()
+        deadline = time.monotonic() + uart.write_timeout
+        view = memoryview(stream)
+        while view:
+            try:
+                view = view[os.write(fd, view) :]
+            except BlockingIOError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError("write timed out during image transfer") from None
+                select.select([], [fd], [], 1)
+
+    def upload_data(self, chunks):
+        if serial is None:
+            raise RuntimeError("pyserial is required for UART upload (pip install pyserial)")
+        with serial.Serial(
+            self._port, baudrate=self._baudrate, timeout=10, write_timeout=10
+        ) as uart:
+            # Wait for the ROM's 'ready to receive' poll byte instead of a fixed delay
+            uart.timeout = 0.1
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if uart.read() == PING:
+                    break
+            else:
+                raise RuntimeError("timed out waiting for the boot ROM ready byte")
+            uart.timeout = 10
+            uart.reset_input_buffer()
+            stream = b"".join(chunks)
+            # Allow for the full transmission time on the blocking write
+            uart.write_timeout = 10 + len(stream) * 10 / uart.baudrate
+            errors = queue.Queue()
+            reader = threading.Thread(
+                target=self._read_acks, args=(uart, len(chunks), errors), daemon=True
+            )
+            reader.start()
+            self._write_stream(uart, stream)
+            reader.join()
+            if not errors.empty():
+                raise errors.get()
+            uart.write(EOT)
+            if not self._no_verify:
+                ack = uart.read()
+                if ack != ACK:
+                    raise RuntimeError("device did not acknowledge end of transfer")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, allow_abbrev=False)
+    parser.add_argument("--firmware", required=True, help="user firmware binary")
+    parser.add_argument("--sysfw", required=True, help="system firmware blob")
+    parser.add_argument("--sysfw-cert", required=True, help="system firmware certificate")
+    parser.add_argument("--board-config", required=True, help="board configuration artifact")
+    parser.add_argument("--key", required=True, help="private key used to sign the image")
+    parser.add_argument("-o", "--output", required=True, help="output image path")
+    parser.add_argument("--uart", help="upload the image over this UART port after building")
+    parser.add_argument(
+        "--baudrate",
+        type=int,
+        default=115200,
+        help="UART baud rate for the upload (default: 115200)",
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="do not wait for the device to verify the transfer",
+    )
+    args = parser.parse_args()
+
+    # SHA-512 releases the GIL inside OpenSSL, so the four inputs hash in parallel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        user_firmware, sysfw_blob, sysfw_cert, board_config = executor.map(
+            BinaryData, [args.firmware, args.sysfw, args.sysfw_cert, args.board_config]
+        )
+
+    binaries = ImageBinaries(user_firmware, sysfw_blob, sysfw_cert, board_config)
+    OutputBinary(binaries, args.key, args.output).write_output()
+
+    if args.uart:
+        transfer_data = TransferDataCreator(Path(args.output).read_bytes(), skip_crc=args.no_verify)
+        uploader = FirmwareUploader(args.uart, baudrate=args.baudrate, no_verify=args.no_verify)
+        uploader.upload_data(transfer_data.get_transfer_chunks())
+
+
+if __name__ == "__main__":
+    main()